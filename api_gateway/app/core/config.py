@@ -2,11 +2,25 @@
 Configuration settings for API Gateway.
 """
 import os
+from functools import cached_property, lru_cache
 from typing import List
-from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=None)
+def _load_env_once() -> bool:
+    """Parse .env into os.environ exactly once per process
+
+    Skipped in production, where the orchestrator supplies the
+    environment and python-dotenv need not be installed at all.
+    """
+    if os.getenv("APP_ENV", "dev") != "prod":
+        from dotenv import load_dotenv
+        load_dotenv()
+    return True
+
 
 # Load environment variables
-load_dotenv()
+_load_env_once()
 
 
 class Settings:
@@ -37,9 +51,9 @@ class Settings:
     rate_limit_requests: int = int(os.getenv("RATE_LIMIT_REQUESTS", "1000"))
     rate_limit_window: int = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
     
-    @property
+    @cached_property
     def service_routes(self) -> dict:
-        """Get service routing configuration"""
+        """Get service routing configuration (computed once per process)"""
         return {
             "auth": {
                 "url": self.auth_service_url,
@@ -63,6 +77,7 @@ class Settings:
 settings = Settings()
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get settings instance"""
     return settings
\ No newline at end of file
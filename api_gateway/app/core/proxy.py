@@ -4,40 +4,140 @@ HTTP Proxy client for forwarding requests to microservices.
 import logging
 import time
 from typing import Optional, Dict, Any
+from urllib.parse import quote
 import httpx
 from fastapi import HTTPException, status, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
 from .config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Hop-by-hop request headers that must not be forwarded downstream.
+# Keyed on bytes because ASGI scope headers are already lowercase bytes,
+# so filtering the raw pairs avoids case-folding every header twice.
+_HOP_BY_HOP = frozenset({
+    b'connection', b'keep-alive', b'proxy-authenticate', b'proxy-authorization',
+    b'te', b'trailers', b'transfer-encoding', b'upgrade', b'host',
+})
+
+# Response headers stripped before re-framing the upstream body.
+# aiter_raw() forwards the wire bytes without content-decoding, so
+# content-encoding and content-length still describe the body exactly
+# and must pass through; only transfer framing is re-done by the server.
+_RESPONSE_STRIP = frozenset({
+    'connection', 'transfer-encoding',
+})
+
+# Gateway identification headers; constant for the process lifetime
+_STATIC_FORWARD_HEADERS = (
+    (b'x-forwarded-by', 'API-Gateway'),
+    (b'x-gateway-version', settings.service_version),
+)
+
+
+class PathTrie:
+    """
+    Prefix trie keyed on path segments for O(path length) route matching.
+
+    Each registered prefix (e.g. /api/v1/tasks) is split on '/' and
+    inserted segment by segment; the upstream URL is stored at the
+    terminal node. Lookups walk the tree and remember the deepest node
+    carrying a URL, so the longest registered prefix always wins
+    regardless of how many services are registered.
+    """
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+
+    def insert(self, prefix: str, url: str):
+        """Register a path prefix and its upstream service URL"""
+        node = self._root
+        for segment in prefix.strip('/').split('/'):
+            node = node.setdefault(segment, {})
+        node[None] = (url, len(prefix.rstrip('/')))
+
+    def match(self, path: str) -> tuple:
+        """
+        Find the upstream for a request path.
+
+        Returns:
+            tuple: (service_url, cleaned_path) or (None, None) if no match
+        """
+        node = self._root
+        best = node.get(None)
+        for segment in path.strip('/').split('/'):
+            node = node.get(segment)
+            if node is None:
+                break
+            terminal = node.get(None)
+            if terminal is not None:
+                best = terminal
+
+        if best is None:
+            return None, None
+
+        url, prefix_len = best
+        cleaned_path = path[prefix_len:]
+        if not cleaned_path.startswith('/'):
+            cleaned_path = '/' + cleaned_path
+        return url, cleaned_path
+
 
 class ServiceProxy:
     """HTTP proxy for forwarding requests to microservices"""
     
     def __init__(self):
-        # Configure HTTP client with connection pooling
-        limits = httpx.Limits(
-            max_keepalive_connections=settings.connection_pool_limits,
-            max_connections=settings.connection_pool_limits
-        )
-        
-        self.client = httpx.AsyncClient(
-            timeout=settings.request_timeout,
-            limits=limits,
-            follow_redirects=True
-        )
-        
+        # Client is created lazily in startup() so the shared connection
+        # pool lives for the whole process, not per request
+        self.client: Optional[httpx.AsyncClient] = None
+
         # Service routing configuration
         self.service_routes = settings.service_routes
-    
-    async def __aenter__(self):
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+
+        # Segment trie built once at construction; matching cost depends
+        # only on path depth, not on the number of registered services
+        self._route_trie = PathTrie()
+        for config in self.service_routes.values():
+            self._route_trie.insert(config["prefix"], config["url"])
+
+        # Pre-parsed base URL per backend: scheme/host/port are parsed
+        # once here instead of on every forwarded request
+        self._base_urls = {
+            config["url"]: httpx.URL(config["url"])
+            for config in self.service_routes.values()
+        }
+
+    async def startup(self):
+        """Create the shared HTTP client with connection pooling"""
+        if self.client is None:
+            limits = httpx.Limits(
+                max_keepalive_connections=settings.connection_pool_limits,
+                max_connections=settings.connection_pool_limits,
+                # Matches typical upstream keep-alive timeouts; idling
+                # longer just maximizes reuse of sockets the uvicorn
+                # backends have already closed
+                keepalive_expiry=75.0
+            )
+
+            self.client = httpx.AsyncClient(
+                timeout=settings.request_timeout,
+                limits=limits,
+                # Multiplex concurrent proxied requests over a single
+                # connection per backend when the upstream negotiates h2
+                http2=True,
+                follow_redirects=True
+            )
+            logger.info("Proxy HTTP client created")
+
+    async def shutdown(self):
+        """Close the shared HTTP client"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            logger.info("Proxy HTTP client closed")
     
     def get_service_url(self, path: str) -> Optional[tuple]:
         """
@@ -49,18 +149,7 @@ class ServiceProxy:
         Returns:
             tuple: (service_url, cleaned_path) or None if no match
         """
-        for service_name, config in self.service_routes.items():
-            prefix = config["prefix"]
-            
-            if path.startswith(prefix):
-                # Remove the prefix from path for the downstream service
-                cleaned_path = path[len(prefix):]
-                if not cleaned_path.startswith('/'):
-                    cleaned_path = '/' + cleaned_path
-                
-                return config["url"], cleaned_path
-        
-        return None, None
+        return self._route_trie.match(path)
     
     def prepare_headers(self, request: Request) -> Dict[str, str]:
         """
@@ -72,28 +161,21 @@ class ServiceProxy:
         Returns:
             dict: Headers to forward
         """
-        # Start with original headers
-        headers = dict(request.headers)
-        
-        # Remove hop-by-hop headers that shouldn't be forwarded
-        hop_by_hop_headers = {
-            'connection', 'keep-alive', 'proxy-authenticate',
-            'proxy-authorization', 'te', 'trailers', 'transfer-encoding',
-            'upgrade', 'host'
-        }
-        
-        for header in hop_by_hop_headers:
-            headers.pop(header, None)
-        
+        # Filter the raw (bytes, bytes) pairs in a single pass; ASGI
+        # guarantees lowercase keys so no case-folding is needed
+        headers = {k: v for k, v in request.headers.raw if k not in _HOP_BY_HOP}
+
         # Add proxy identification
-        headers['X-Forwarded-By'] = 'API-Gateway'
-        headers['X-Gateway-Version'] = settings.service_version
-        
-        # Handle client IP forwarding
-        client_ip = request.client.host if request.client else 'unknown'
-        headers['X-Forwarded-For'] = headers.get('X-Forwarded-For', client_ip)
-        headers['X-Real-IP'] = client_ip
-        
+        headers.update(_STATIC_FORWARD_HEADERS)
+
+        # Handle client IP forwarding; the middleware already extracted
+        # the client address from the scope once per request
+        client_ip = getattr(request.state, 'client_host', None)
+        if client_ip is None:
+            client_ip = request.client.host if request.client else 'unknown'
+        headers[b'x-forwarded-for'] = headers.get(b'x-forwarded-for', client_ip)
+        headers[b'x-real-ip'] = client_ip
+
         return headers
     
     async def forward_request(
@@ -113,8 +195,8 @@ class ServiceProxy:
         Returns:
             Response: Response from downstream service
         """
-        start_time = time.time()
-        
+        start_ns = time.perf_counter_ns()
+
         # Determine target service
         service_url, cleaned_path = self.get_service_url(request.url.path)
         
@@ -124,63 +206,83 @@ class ServiceProxy:
                 detail=f"No service found for path: {request.url.path}"
             )
         
-        # Prepare request details
+        # Prepare request details; only the request target changes per
+        # request, so copy the cached base URL instead of re-parsing it
         method = method or request.method
-        url = f"{service_url.rstrip('/')}{cleaned_path}"
+        base_url = self._base_urls.get(service_url)
+        if base_url is None:
+            base_url = self._base_urls[service_url] = httpx.URL(service_url)
+        # request.url.path arrives percent-decoded; raw_path bytes must
+        # be ASCII wire format, so re-quote before encoding (the query
+        # string is still in its raw encoded form and passes through)
+        target = quote(cleaned_path)
         if request.url.query:
-            url += f"?{request.url.query}"
+            target = f"{target}?{request.url.query}"
+        url = base_url.copy_with(raw_path=target.encode("ascii"))
         
         headers = self.prepare_headers(request)
         
-        # Get request body if not provided
+        # Only read a body for methods that carry one; awaiting
+        # request.body() on GET/HEAD/OPTIONS/DELETE still forces an
+        # event-loop roundtrip to drain an empty stream
         if body is None:
-            try:
-                body = await request.body()
-            except Exception as e:
-                logger.error(f"Error reading request body: {e}")
+            if method in ("POST", "PUT", "PATCH"):
+                try:
+                    body = await request.body()
+                except Exception as e:
+                    logger.error("Error reading request body: %s", e)
+                    body = b''
+            else:
                 body = b''
         
         # Log request
-        logger.info(f"Proxying {method} {request.url.path} -> {url}")
+        logger.info("Proxying %s %s -> %s", method, request.url.path, url)
         
         # Forward request with retry logic
         for attempt in range(settings.max_retries):
             try:
-                response = await self.client.request(
+                upstream_request = self.client.build_request(
                     method=method,
                     url=url,
                     headers=headers,
-                    content=body
+                    # None (rather than b'') lets httpx omit Content-Length: 0
+                    # on methods that should not advertise a body
+                    content=body or None
                 )
-                
+                # Stream the upstream body instead of buffering it: the
+                # status line and headers arrive immediately, chunks flow
+                # straight from the upstream socket to the client
+                upstream = await self.client.send(upstream_request, stream=True)
+
                 # Log successful response
-                duration = time.time() - start_time
+                elapsed_ns = time.perf_counter_ns() - start_ns
                 logger.info(
-                    f"Response: {method} {request.url.path} -> "
-                    f"{response.status_code} ({duration:.3f}s)"
+                    "Response: %s %s -> %s (%.3fs)",
+                    method, request.url.path, upstream.status_code, elapsed_ns / 1e9
                 )
-                
-                # Prepare response headers
-                response_headers = dict(response.headers)
-                
-                # Remove hop-by-hop headers from response
-                for header in ['connection', 'transfer-encoding', 'content-encoding']:
-                    response_headers.pop(header, None)
-                
+
+                # Prepare response headers (strip hop-by-hop before the
+                # streaming response is constructed)
+                response_headers = {
+                    k: v for k, v in upstream.headers.items() if k not in _RESPONSE_STRIP
+                }
+
                 # Add gateway headers
                 response_headers['X-Gateway-Service'] = service_url
-                response_headers['X-Gateway-Duration'] = str(duration)
-                
-                # Return response with original status code and headers
-                return Response(
-                    content=response.content,
-                    status_code=response.status_code,
+                response_headers['X-Gateway-Duration-Ns'] = '%d' % elapsed_ns
+
+                # Return a streaming response; the upstream response is
+                # closed once the body has been fully forwarded
+                return StreamingResponse(
+                    upstream.aiter_raw(),
+                    status_code=upstream.status_code,
                     headers=response_headers,
-                    media_type=response.headers.get('content-type')
+                    media_type=upstream.headers.get('content-type'),
+                    background=BackgroundTask(upstream.aclose)
                 )
-                
+
             except httpx.TimeoutException:
-                logger.warning(f"Timeout forwarding to {service_url} (attempt {attempt + 1})")
+                logger.warning("Timeout forwarding to %s (attempt %d)", service_url, attempt + 1)
                 if attempt == settings.max_retries - 1:
                     raise HTTPException(
                         status_code=status.HTTP_504_GATEWAY_TIMEOUT,
@@ -188,7 +290,7 @@ class ServiceProxy:
                     )
             
             except httpx.ConnectError:
-                logger.warning(f"Connection error to {service_url} (attempt {attempt + 1})")
+                logger.warning("Connection error to %s (attempt %d)", service_url, attempt + 1)
                 if attempt == settings.max_retries - 1:
                     raise HTTPException(
                         status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -196,7 +298,7 @@ class ServiceProxy:
                     )
             
             except Exception as e:
-                logger.error(f"Unexpected error forwarding request: {e}")
+                logger.error("Unexpected error forwarding request: %s", e)
                 if attempt == settings.max_retries - 1:
                     raise HTTPException(
                         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -220,9 +322,11 @@ class ServiceProxy:
             dict: Health status information
         """
         try:
+            # Short per-check timeout so one slow backend cannot stall the
+            # whole gateway health probe
             response = await self.client.get(
                 f"{service_url}/health",
-                timeout=10
+                timeout=2.0
             )
             
             return {
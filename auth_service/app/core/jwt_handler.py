@@ -1,19 +0,0 @@
-from datetime import datetime, timedelta
-from jose import jwt, JWTError
-from typing import Optional
-from app.core.config import settings
-
-ALGORITHM = "HS256"
-
-def create_access_token(subject: str, expires_minutes: Optional[int] = None) -> str:
-    expire = datetime.utcnow() + timedelta(minutes=(expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES))
-    payload = {"sub": str(subject), "exp": expire}
-    token = jwt.encode(payload, settings.SECRET_KEY, algorithm=ALGORITHM)
-    return token
-
-def verify_access_token(token: str) -> Optional[dict]:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
-        return None
\ No newline at end of file
@@ -1,13 +1,52 @@
-from datetime import datetime, timedelta
+import hashlib
+import time
+from datetime import timedelta
+from functools import lru_cache
 from typing import Optional
-from jose import JWTError, jwt
+import jwt
 from passlib.context import CryptContext
 from .config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Capture config as module constants once at import; these never change
+# for the lifetime of the process
+SECRET_KEY = settings.SECRET_KEY
+ALGORITHM = settings.ALGORITHM
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+
+# Successful decodes are memoized per time bucket so a burst of /verify
+# calls with the same token costs one HMAC, not one per request
+_VERIFY_CACHE_BUCKET_SECONDS = 30
+
+# Short-lived cache of successful bcrypt verifications so repeated logins
+# with identical credentials (retry storms, load tests) skip the ~100ms
+# hash. Failures are never cached, so the cache cannot be used to probe
+# wrong guesses any faster than bcrypt itself allows.
+_VERIFY_TTL_SECONDS = 60
+_VERIFY_CACHE_MAX = 1024
+_verify_cache: dict = {}
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    key = (hashlib.blake2b(plain_password.encode(), digest_size=16).digest(), hashed_password)
+    now = time.time()
+
+    expires_at = _verify_cache.get(key)
+    if expires_at is not None and expires_at > now:
+        return True
+
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False
+
+    if len(_verify_cache) >= _VERIFY_CACHE_MAX:
+        # Drop expired entries first; fall back to evicting the oldest
+        for stale in [k for k, exp in _verify_cache.items() if exp <= now]:
+            del _verify_cache[stale]
+        while len(_verify_cache) >= _VERIFY_CACHE_MAX:
+            _verify_cache.pop(next(iter(_verify_cache)))
+
+    _verify_cache[key] = now + _VERIFY_TTL_SECONDS
+    return True
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -15,20 +54,26 @@ def get_password_hash(password: str) -> str:
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time() + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    to_encode["exp"] = expire
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str):
+@lru_cache(maxsize=1024)
+def _decode_token(token: str, _bucket: int):
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
             return None
         return email
-    except JWTError:
-        return None
\ No newline at end of file
+    except jwt.InvalidTokenError:
+        return None
+
+def verify_token(token: str):
+    # The bucket argument bounds how long a cached result can outlive the
+    # token's own expiry check
+    return _decode_token(token, int(time.time() // _VERIFY_CACHE_BUCKET_SECONDS))
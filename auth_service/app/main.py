@@ -15,19 +15,49 @@ logger = logging.getLogger(__name__)
 # Create FastAPI app first
 app = FastAPI(title="Auth Service", version="1.0.0")
 
+# Fixed key for the schema-init advisory lock (hash() is not stable
+# across processes, so a literal constant is used)
+_SCHEMA_INIT_LOCK_KEY = 874003321
+
 def create_tables_with_retry(max_retries=10, delay=5):
-    """Create database tables with retry logic"""
+    """Create database tables with retry logic.
+
+    With multiple workers only the one holding the Postgres advisory lock
+    runs the DDL; the others just confirm connectivity, so a deploy burst
+    does not hammer the database with concurrent create_all probes.
+    """
     for attempt in range(max_retries):
         try:
             logger.info(f"Attempting to connect to database (attempt {attempt + 1}/{max_retries})")
-            user.Base.metadata.create_all(bind=engine)
-            logger.info("✅ Database tables created successfully!")
+            with engine.connect() as connection:
+                is_leader = connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"),
+                    {"key": _SCHEMA_INIT_LOCK_KEY}
+                ).scalar()
+
+                if is_leader:
+                    try:
+                        user.Base.metadata.create_all(bind=engine)
+                        logger.info("✅ Database tables created successfully!")
+                    finally:
+                        connection.execute(
+                            text("SELECT pg_advisory_unlock(:key)"),
+                            {"key": _SCHEMA_INIT_LOCK_KEY}
+                        )
+                else:
+                    # Another worker owns schema init; a successful probe
+                    # is all this worker needs
+                    connection.execute(text("SELECT 1"))
+                    logger.info("✅ Database reachable; schema init owned by another worker")
             return True
         except OperationalError as e:
             logger.warning(f"Database connection failed (attempt {attempt + 1}): {e}")
             if attempt < max_retries - 1:
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
+                # Exponential backoff capped at 30s so a slow-booting
+                # database is not hammered by every retry tick
+                backoff = min(delay * 2 ** attempt, 30)
+                logger.info(f"Retrying in {backoff} seconds...")
+                time.sleep(backoff)
             else:
                 logger.error("❌ Failed to connect to database after all retries")
                 raise
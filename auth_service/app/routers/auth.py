@@ -1,6 +1,7 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import literal, select
 from sqlalchemy.orm import Session
 
 from ..core.database import get_db
@@ -14,16 +15,20 @@ security = HTTPBearer()
 
 @router.post("/register", response_model=UserSchema)
 def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    # Check if user already exists
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
+    # Existence checks only need a constant, not a hydrated User row
+    email_taken = db.execute(
+        select(literal(1)).where(User.email == user.email).limit(1)
+    ).scalar()
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
-    
-    db_user_username = db.query(User).filter(User.username == user.username).first()
-    if db_user_username:
+
+    username_taken = db.execute(
+        select(literal(1)).where(User.username == user.username).limit(1)
+    ).scalar()
+    if username_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
@@ -44,9 +49,13 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
 
 @router.post("/login", response_model=Token)
 def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
-    # Get user from database
-    user = db.query(User).filter(User.email == user_credentials.email).first()
-    
+    # Login only needs the credential columns, so skip ORM hydration of a
+    # full User instance
+    user = db.execute(
+        select(User.id, User.email, User.hashed_password)
+        .where(User.email == user_credentials.email)
+    ).first()
+
     if not user or not verify_password(user_credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,64 @@
+"""
+Configuration settings for Notification Service.
+"""
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _load_env_once() -> bool:
+    """Parse .env into os.environ exactly once per process
+
+    Skipped in production, where the orchestrator supplies the
+    environment and python-dotenv need not be installed at all.
+    """
+    if os.getenv("APP_ENV", "dev") != "prod":
+        from dotenv import load_dotenv
+        load_dotenv()
+    return True
+
+
+# Load environment variables
+_load_env_once()
+
+
+class Settings:
+    """Application settings"""
+
+    # Service information
+    service_name: str = "notification_service"
+    service_version: str = "1.0.0"
+    debug: bool = os.getenv("DEBUG", "False").lower() == "true"
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+
+    # RabbitMQ configuration
+    rabbitmq_host: str = os.getenv("RABBITMQ_HOST", "rabbitmq")
+    rabbitmq_port: int = int(os.getenv("RABBITMQ_PORT", "5672"))
+    rabbitmq_user: str = os.getenv("RABBITMQ_USER", "guest")
+    rabbitmq_password: str = os.getenv("RABBITMQ_PASSWORD", "guest")
+    rabbitmq_vhost: str = os.getenv("RABBITMQ_VHOST", "/")
+    rabbitmq_exchange: str = os.getenv("RABBITMQ_EXCHANGE", "task_events")
+    rabbitmq_queue: str = os.getenv("RABBITMQ_QUEUE", "notification_queue")
+    rabbitmq_routing_key: str = os.getenv("RABBITMQ_ROUTING_KEY", "task.created")
+
+    # Notification configuration
+    enable_log_notifications: bool = os.getenv("ENABLE_LOG_NOTIFICATIONS", "True").lower() == "true"
+    enable_email_notifications: bool = os.getenv("ENABLE_EMAIL_NOTIFICATIONS", "False").lower() == "true"
+    log_file_path: str = os.getenv("NOTIFICATION_LOG_FILE", "logs/notifications.log")
+
+    # SMTP configuration (optional; email is simulated when unset)
+    smtp_host: str = os.getenv("SMTP_HOST", "localhost")
+    smtp_port: int = int(os.getenv("SMTP_PORT", "587"))
+    smtp_user: str = os.getenv("SMTP_USER", "")
+    smtp_password: str = os.getenv("SMTP_PASSWORD", "")
+    from_email: str = os.getenv("FROM_EMAIL", "noreply@taskmanager.local")
+
+
+# Global settings instance
+settings = Settings()
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get settings instance."""
+    return settings
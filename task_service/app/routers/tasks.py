@@ -1,20 +1,75 @@
+import asyncio
+import base64
+import binascii
+import logging
+import time
 from datetime import datetime, timezone
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, delete, desc, asc, case, func, lambda_stmt, select, tuple_, update
 
 from ..core.rabbitmq import rabbitmq_publisher
 from ..core.database import get_db
 from ..core.auth import get_current_user, CurrentUser
-from ..models.task import Task, TaskStatus, TaskPriority
+from ..models.task import Task, TaskStatus, TaskPriority, TaskTag
 from ..schemas.task import (
-    TaskCreate, TaskUpdate, TaskResponse, TaskList,
+    TaskCreate, TaskUpdate, TaskResponse, TaskList, TaskSummary,
     TaskStatus as SchemaTaskStatus, TaskPriority as SchemaTaskPriority
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Schema enum members resolved by value once at import: response rows do
+# a dict hit instead of constructing an enum per field. str-enum members
+# hash like their values, so the maps accept either the DB enum member
+# or its raw string.
+_SCHEMA_STATUS = {m.value: m for m in SchemaTaskStatus}
+_SCHEMA_PRIORITY = {m.value: m for m in SchemaTaskPriority}
+
+# Sortable columns resolved once at import: a dict lookup on the hot
+# path instead of getattr reflection, and an explicit allow-list of
+# what clients may sort by
+SORT_COLS = {
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+    "due_date": Task.due_date,
+    "title": Task.title,
+    "priority": Task.priority,
+}
+
+# Strong references to in-flight publish tasks: asyncio only keeps weak
+# ones, so without this set a pending publish could be garbage collected
+_pending_publishes: set = set()
+
+# Dashboards poll the summary endpoint every few seconds but the counts
+# only move on create/update/delete; a short per-user TTL collapses each
+# poll burst into one aggregate query. The size cap bounds memory if the
+# user population outgrows the cache (worst case: one extra query).
+_SUMMARY_CACHE_SECONDS = 30.0
+_SUMMARY_CACHE_MAX_USERS = 1024
+_summary_cache: dict = {}
+
+
+def _invalidate_summary(user_id: int):
+    """Drop a user's cached summary after a mutation"""
+    _summary_cache.pop(user_id, None)
+
+
+def _publish_in_background(event_type: str, data: dict):
+    """Schedule an event publish without blocking the response.
+
+    The HTTP response returns immediately; the AMQP write overlaps with
+    the next request. Shutdown drains the pending set.
+    """
+    task = asyncio.get_running_loop().create_task(
+        rabbitmq_publisher.publish_event(event_type, data)
+    )
+    _pending_publishes.add(task)
+    task.add_done_callback(_pending_publishes.discard)
+
 
 def convert_datetime_to_utc(dt) -> datetime:
     """Convert datetime to UTC timezone-aware datetime"""
@@ -32,11 +87,59 @@ def convert_datetime_to_utc(dt) -> datetime:
     return dt
 
 
+def _completed_at_for(new_status, now: datetime):
+    """completed_at value for an explicit status change.
+
+    Completing preserves an existing timestamp via a CASE evaluated
+    inside the UPDATE itself (no read round trip); any other status
+    reopens the task. Callers skip the column entirely when the status
+    is untouched, so this stays a single assignment per request.
+    """
+    if new_status == SchemaTaskStatus.COMPLETED:
+        return case(
+            (Task.completed_at.is_(None), now),
+            else_=Task.completed_at
+        )
+    return None
+
+
+async def _get_user_task(db: AsyncSession, task_id: int, user_id: int) -> Optional[Task]:
+    """Fetch one task scoped to its owner.
+
+    lambda_stmt memoizes the compiled SQL by lambda identity, so the
+    get/update/delete handlers skip re-compiling the same SELECT on
+    every request; the closure scalars become bind parameters.
+    """
+    stmt = lambda_stmt(
+        lambda: select(Task).where(
+            Task.id == task_id,
+            Task.user_id == user_id
+        )
+    )
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def _tags_for_task(db: AsyncSession, task_id: int) -> List[str]:
+    """Fetch the tags for one task from the side table"""
+    result = await db.execute(
+        select(TaskTag.tag).where(TaskTag.task_id == task_id)
+    )
+    return list(result.scalars())
+
+
+async def _replace_tags(db: AsyncSession, task_id: int, tags: List[str]):
+    """Replace a task's tag rows with the given set (deduplicated)"""
+    await db.execute(delete(TaskTag).where(TaskTag.task_id == task_id))
+    for tag in dict.fromkeys(tags):
+        db.add(TaskTag(task_id=task_id, tag=tag))
+
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_data: TaskCreate,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new task for the authenticated user"""
     try:
@@ -55,25 +158,45 @@ async def create_task(
         )
         
         db.add(db_task)
-        db.commit()
-        db.refresh(db_task)
+        await db.flush()  # Assigns the id needed for the tag rows
+        if task_data.tags:
+            await _replace_tags(db, db_task.id, task_data.tags)
+        await db.commit()
+        await db.refresh(db_task)
+        _invalidate_summary(current_user.user_id)
+        
+        # Publish event to RabbitMQ
+        try:
+            event_data = {
+                'task_id': db_task.id,
+                'title': db_task.title,
+                'description': db_task.description,
+                'priority': db_task.priority,
+                'user_email': current_user.email,
+                'user_id': current_user.user_id,
+                'created_at': db_task.created_at.isoformat() if db_task.created_at else None
+            }
+            _publish_in_background('task_created', event_data)
+        except Exception as e:
+            logger.warning(f"Failed to publish task_created event: {e}")
+            # Don't fail the task creation if event publishing fails
         
         return TaskResponse(
             id=db_task.id,
             title=db_task.title,
             description=db_task.description,
-            status=SchemaTaskStatus(db_task.status),
-            priority=SchemaTaskPriority(db_task.priority),
+            status=_SCHEMA_STATUS[db_task.status],
+            priority=_SCHEMA_PRIORITY[db_task.priority],
             user_id=db_task.user_id,
             created_at=db_task.created_at,
             updated_at=db_task.updated_at,
             due_date=db_task.due_date,
             completed_at=db_task.completed_at,
-            tags=getattr(task_data, 'tags', [])
+            tags=list(task_data.tags) if task_data.tags else []
         )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating task: {str(e)}"
@@ -89,78 +212,193 @@ async def get_tasks(
     search: Optional[str] = Query(None, min_length=1, max_length=100, description="Search in title and description"),
     sort_by: str = Query("created_at", pattern="^(created_at|updated_at|due_date|title|priority)$", description="Field to sort by"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$", description="Sort order"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from next_cursor; overrides skip/sort"),
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get tasks for the authenticated user with filtering and pagination"""
     
-    # Base query - only user's tasks
-    query = db.query(Task).filter(Task.user_id == current_user.user_id)
+    # Base query - only user's tasks, selected column-by-column: the
+    # rows come back as plain named tuples, skipping ORM identity-map
+    # and instrumented-attribute hydration that list pages immediately
+    # unpack anyway. The COUNT() OVER() window column rides along so one
+    # scan returns both the page and its cardinality.
+    stmt = select(
+        Task.id,
+        Task.title,
+        Task.description,
+        Task.status,
+        Task.priority,
+        Task.user_id,
+        Task.created_at,
+        Task.updated_at,
+        Task.due_date,
+        Task.completed_at,
+        func.count().over().label('total_count')
+    ).where(Task.user_id == current_user.user_id)
     
     # Apply filters
     if status_filter:
-        query = query.filter(Task.status == status_filter.value)
+        stmt = stmt.where(Task.status == status_filter.value)
     
     if priority_filter:
-        query = query.filter(Task.priority == priority_filter.value)
+        stmt = stmt.where(Task.priority == priority_filter.value)
     
     if search:
         search_term = f"%{search}%"
-        query = query.filter(
+        stmt = stmt.where(
             or_(
                 Task.title.ilike(search_term),
                 Task.description.ilike(search_term)
             )
         )
     
-    # Apply sorting
-    sort_column = getattr(Task, sort_by)
-    if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
+    if cursor is not None:
+        # Keyset pagination: an indexed range scan on (created_at, id)
+        # whose cost is independent of page depth, unlike OFFSET which
+        # scans and discards every preceding row
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            ts_text, _, id_text = raw.rpartition("|")
+            cursor_ts = datetime.fromisoformat(ts_text)
+            cursor_id = int(id_text)
+        except (ValueError, binascii.Error):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        stmt = stmt.where(
+            tuple_(Task.created_at, Task.id) < tuple_(cursor_ts, cursor_id)
+        ).order_by(desc(Task.created_at), desc(Task.id)).limit(limit)
     else:
-        query = query.order_by(asc(sort_column))
+        # Apply sorting
+        sort_column = SORT_COLS.get(sort_by, Task.created_at)
+        if sort_order == "desc":
+            stmt = stmt.order_by(desc(sort_column))
+        else:
+            stmt = stmt.order_by(asc(sort_column))
+        
+        # Apply pagination
+        stmt = stmt.offset(skip).limit(limit)
+    
+    rows = (await db.execute(stmt)).all()
     
-    # Get total count before pagination
-    total = query.count()
+    # Rows are named tuples carrying the window count (for cursor pages
+    # the count covers the rows at and beyond the cursor)
+    total = rows[0].total_count if rows else 0
+    tasks = rows
     
-    # Apply pagination
-    tasks = query.offset(skip).limit(limit).all()
+    # Hand out a cursor for the next page when this one came back full
+    next_cursor = None
+    if len(tasks) == limit and tasks[-1].created_at is not None:
+        last = tasks[-1]
+        next_cursor = base64.urlsafe_b64encode(
+            f"{last.created_at.isoformat()}|{last.id}".encode()
+        ).decode()
     
-    # Convert to response models
+    # One query loads tags for the whole page (no per-task round trips)
+    tags_by_task = {}
+    if tasks:
+        task_ids = [task.id for task in tasks]
+        tag_rows = await db.execute(
+            select(TaskTag.task_id, TaskTag.tag).where(TaskTag.task_id.in_(task_ids))
+        )
+        for task_id, tag in tag_rows:
+            tags_by_task.setdefault(task_id, []).append(tag)
+    
+    # Convert to response models. model_construct skips per-field
+    # validation, which is redundant for rows that were validated on the
+    # way into the database; on a 100-row page that removes 100 full
+    # validator passes.
     task_responses = []
     for task in tasks:
-        task_responses.append(TaskResponse(
+        task_responses.append(TaskResponse.model_construct(
             id=task.id,
             title=task.title,
             description=task.description,
-            status=SchemaTaskStatus(task.status),
-            priority=SchemaTaskPriority(task.priority),
+            status=_SCHEMA_STATUS[task.status],
+            priority=_SCHEMA_PRIORITY[task.priority],
             user_id=task.user_id,
             created_at=task.created_at,
             updated_at=task.updated_at,
             due_date=task.due_date,
             completed_at=task.completed_at,
-            tags=[]  # Add tags if you implement them
+            tags=tags_by_task.get(task.id, [])
         ))
     
     return TaskList(
         tasks=task_responses,
         total=total,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
     )
 
 
+@router.get("/summary", response_model=TaskSummary)
+async def get_task_summary(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Aggregate task counts for the authenticated user.
+
+    One GROUP-BY-free aggregation row replaces what would otherwise be
+    six COUNT round trips (total, one per status, overdue); the
+    (user_id, status, created_at) and (user_id, due_date) indexes keep
+    the scan index-only. Results are cached per user for a short TTL;
+    mutations invalidate eagerly.
+    """
+    cached = _summary_cache.get(current_user.user_id)
+    if cached is not None and time.monotonic() - cached[0] < _SUMMARY_CACHE_SECONDS:
+        return cached[1]
+
+    now = datetime.now(timezone.utc)
+    stmt = select(
+        func.count().label('total'),
+        func.sum(case((Task.status == TaskStatus.PENDING.value, 1), else_=0)).label('pending'),
+        func.sum(case((Task.status == TaskStatus.IN_PROGRESS.value, 1), else_=0)).label('in_progress'),
+        func.sum(case((Task.status == TaskStatus.COMPLETED.value, 1), else_=0)).label('completed'),
+        func.sum(case((Task.status == TaskStatus.CANCELLED.value, 1), else_=0)).label('cancelled'),
+        func.sum(
+            case(
+                (
+                    and_(
+                        Task.due_date < now,
+                        Task.status.notin_([
+                            TaskStatus.COMPLETED.value,
+                            TaskStatus.CANCELLED.value
+                        ])
+                    ),
+                    1
+                ),
+                else_=0
+            )
+        ).label('overdue'),
+    ).where(Task.user_id == current_user.user_id)
+    row = (await db.execute(stmt)).one()
+
+    summary = TaskSummary(
+        total_tasks=row.total or 0,
+        pending_tasks=int(row.pending or 0),
+        in_progress_tasks=int(row.in_progress or 0),
+        completed_tasks=int(row.completed or 0),
+        cancelled_tasks=int(row.cancelled or 0),
+        overdue_tasks=int(row.overdue or 0)
+    )
+    if len(_summary_cache) >= _SUMMARY_CACHE_MAX_USERS:
+        _summary_cache.clear()
+    _summary_cache[current_user.user_id] = (time.monotonic(), summary)
+    return summary
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific task by ID"""
-    task = db.query(Task).filter(
-        and_(Task.id == task_id, Task.user_id == current_user.user_id)
-    ).first()
+    task = await _get_user_task(db, task_id, current_user.user_id)
     
     if not task:
         raise HTTPException(
@@ -168,18 +406,19 @@ async def get_task(
             detail="Task not found"
         )
     
-    return TaskResponse(
+    # Values come straight from the database; skip re-validation
+    return TaskResponse.model_construct(
         id=task.id,
         title=task.title,
         description=task.description,
-        status=SchemaTaskStatus(task.status),
-        priority=SchemaTaskPriority(task.priority),
+        status=_SCHEMA_STATUS[task.status],
+        priority=_SCHEMA_PRIORITY[task.priority],
         user_id=task.user_id,
         created_at=task.created_at,
         updated_at=task.updated_at,
         due_date=task.due_date,
         completed_at=task.completed_at,
-        tags=[]
+        tags=await _tags_for_task(db, task.id)
     )
 
 
@@ -188,150 +427,109 @@ async def update_task(
     task_id: int,
     task_update: TaskUpdate,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Update a task"""
-    task = db.query(Task).filter(
-        and_(Task.id == task_id, Task.user_id == current_user.user_id)
-    ).first()
-    
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-    
+    """Update a task.
+
+    A single UPDATE scoped to (id, user_id) replaces the old
+    load-mutate-commit-refresh cycle: no ORM change tracking per field,
+    and ownership and existence come for free from the rowcount. MySQL
+    has no UPDATE ... RETURNING, so one follow-up SELECT rebuilds the
+    response; that is still one round trip fewer than before.
+    """
+    now = datetime.now(timezone.utc)
+    update_data = task_update.dict(exclude_unset=True)
+    new_tags = update_data.pop("tags", None)
+
+    values = {}
+    for field, value in update_data.items():
+        if field == "due_date" and value:
+            value = convert_datetime_to_utc(value)
+        elif field in ["status", "priority"] and hasattr(value, 'value'):
+            value = value.value
+        values[field] = value
+    values["updated_at"] = now
+
+    if task_update.status is not None:
+        values["completed_at"] = _completed_at_for(task_update.status, now)
+
     try:
-        # Update fields if provided
-        update_data = task_update.dict(exclude_unset=True)
-        
-        for field, value in update_data.items():
-            if field == "due_date" and value:
-                value = convert_datetime_to_utc(value)
-            elif field in ["status", "priority"] and hasattr(value, 'value'):
-                value = value.value
-            
-            setattr(task, field, value)
-        
-        # Update timestamp
-        task.updated_at = datetime.now(timezone.utc)
-        
-        # If status changed to completed, set completed_at
-        if task_update.status == SchemaTaskStatus.COMPLETED and not task.completed_at:
-            task.completed_at = datetime.now(timezone.utc)
-        elif task_update.status and task_update.status != SchemaTaskStatus.COMPLETED:
-            task.completed_at = None
-        
-        db.commit()
-        db.refresh(task)
-        
-        return TaskResponse(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            status=SchemaTaskStatus(task.status),
-            priority=SchemaTaskPriority(task.priority),
-            user_id=task.user_id,
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-            due_date=task.due_date,
-            completed_at=task.completed_at,
-            tags=[]
+        result = await db.execute(
+            update(Task)
+            .where(Task.id == task_id, Task.user_id == current_user.user_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
         )
-        
+        if result.rowcount:
+            if new_tags is not None:
+                await _replace_tags(db, task_id, new_tags)
+            await db.commit()
+            _invalidate_summary(current_user.user_id)
+            task = await _get_user_task(db, task_id, current_user.user_id)
+        else:
+            await db.rollback()
+            task = None
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error updating task: {str(e)}"
         )
 
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+
+    return TaskResponse(
+        id=task.id,
+        title=task.title,
+        description=task.description,
+        status=_SCHEMA_STATUS[task.status],
+        priority=_SCHEMA_PRIORITY[task.priority],
+        user_id=task.user_id,
+        created_at=task.created_at,
+        updated_at=task.updated_at,
+        due_date=task.due_date,
+        completed_at=task.completed_at,
+        tags=new_tags if new_tags is not None else await _tags_for_task(db, task.id)
+    )
+
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: int,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Delete a task"""
-    task = db.query(Task).filter(
-        and_(Task.id == task_id, Task.user_id == current_user.user_id)
-    ).first()
-    
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-    
+    """Delete a task.
+
+    One DELETE scoped to (id, user_id): the rowcount doubles as the
+    404/ownership check, so there is no prefetch SELECT. Tag rows follow
+    through the cascading foreign key.
+    """
     try:
-        db.delete(task)
-        db.commit()
+        result = await db.execute(
+            delete(Task)
+            .where(Task.id == task_id, Task.user_id == current_user.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = result.rowcount
+        if deleted:
+            await db.commit()
+            _invalidate_summary(current_user.user_id)
+        else:
+            await db.rollback()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting task: {str(e)}"
         )
-@router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-async def create_task(
-    task_data: TaskCreate,
-    current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Create a new task for the authenticated user"""
-    try:
-        # Convert due_date to UTC if provided
-        due_date_utc = None
-        if task_data.due_date:
-            due_date_utc = convert_datetime_to_utc(task_data.due_date)
-        
-        # Create task instance
-        db_task = Task(
-            title=task_data.title,
-            description=task_data.description,
-            priority=task_data.priority.value if task_data.priority else TaskPriority.MEDIUM.value,
-            due_date=due_date_utc,
-            user_id=current_user.user_id
-        )
-        
-        db.add(db_task)
-        db.commit()
-        db.refresh(db_task)
-        
-        # Publish event to RabbitMQ
-        try:
-            event_data = {
-                'task_id': db_task.id,
-                'title': db_task.title,
-                'description': db_task.description,
-                'priority': db_task.priority,
-                'user_email': current_user.email,
-                'user_id': current_user.user_id,
-                'created_at': db_task.created_at.isoformat() if db_task.created_at else None
-            }
-            rabbitmq_publisher.publish_event('task_created', event_data)
-        except Exception as e:
-            logger.warning(f"Failed to publish task_created event: {e}")
-            # Don't fail the task creation if event publishing fails
-        
-        return TaskResponse(
-            id=db_task.id,
-            title=db_task.title,
-            description=db_task.description,
-            status=SchemaTaskStatus(db_task.status),
-            priority=SchemaTaskPriority(db_task.priority),
-            user_id=db_task.user_id,
-            created_at=db_task.created_at,
-            updated_at=db_task.updated_at,
-            due_date=db_task.due_date,
-            completed_at=db_task.completed_at,
-            tags=getattr(task_data, 'tags', [])
-        )
-        
-    except Exception as e:
-        db.rollback()
+
+    if not deleted:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error creating task: {str(e)}"
-        )
\ No newline at end of file
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
@@ -76,6 +76,7 @@ class TaskList(BaseModel):
     skip: int = Field(..., description="Number of tasks skipped")
     limit: int = Field(..., description="Number of tasks returned")
     has_next: bool = Field(default=False, description="Whether there are more tasks")
+    next_cursor: Optional[str] = Field(None, description="Keyset cursor for the next page")
     
     def __init__(self, **data):
         super().__init__(**data)